@@ -1,8 +1,18 @@
 import os
+from types import MappingProxyType
 from dotenv import load_dotenv
 
+_env_loaded = False
+
+def load_env():
+    """Load environment variables from .env, at most once per process"""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
 # Load environment variables
-load_dotenv()
+load_env()
 
 class Config:
     # Affinity Configuration
@@ -20,6 +30,10 @@ class Config:
     TWITTER_BEARER_TOKEN = os.getenv('TWITTER_BEARER_TOKEN')
     CRUNCHBASE_API_KEY = os.getenv('CRUNCHBASE_API_KEY')
     
+    # Google Sheets Configuration
+    GOOGLE_SHEETS_CREDENTIALS = os.getenv('GOOGLE_SHEETS_CREDENTIALS')
+    SPREADSHEET_ID = os.getenv('SPREADSHEET_ID')
+    
     # Server Configuration
     HOST = "0.0.0.0"
     PORT = int(os.getenv('PORT', '8000'))
@@ -34,11 +48,12 @@ class Config:
     
     # Market Intelligence Configuration
     MARKET_SCAN_INTERVAL = 3600  # seconds
+    COMPANY_INSIGHTS_CACHE_TTL = 300  # seconds
     MAX_NEWS_AGE_DAYS = 7
     MIN_SOCIAL_ENGAGEMENT = 10
     
     # Sector Keywords (can be extended)
-    SECTOR_KEYWORDS = {
+    SECTOR_KEYWORDS = MappingProxyType({
         'climate_tech': [
             'climate', 'renewable', 'sustainability', 'clean energy',
             'carbon', 'environmental', 'green tech'
@@ -63,18 +78,18 @@ class Config:
             'education technology', 'learning platform', 'e-learning',
             'online education', 'educational'
         ]
-    }
+    })
     
     # Investment Criteria Weights
-    CRITERIA_WEIGHTS = {
+    CRITERIA_WEIGHTS = MappingProxyType({
         'team': 0.35,
         'business': 0.30,
         'technology': 0.20,
         'impact': 0.15
-    }
+    })
     
     # Team Evaluation Criteria
-    TEAM_CRITERIA = {
+    TEAM_CRITERIA = MappingProxyType({
         'education': {
             'weight': 0.3,
             'keywords': [
@@ -96,10 +111,10 @@ class Config:
                 'communication skills', 'team management'
             ]
         }
-    }
+    })
     
     # Business Evaluation Criteria
-    BUSINESS_CRITERIA = {
+    BUSINESS_CRITERIA = MappingProxyType({
         'market_size': {
             'weight': 0.4,
             'keywords': [
@@ -121,10 +136,10 @@ class Config:
                 'breakthrough'
             ]
         }
-    }
+    })
     
     # Technology Evaluation Criteria
-    TECHNOLOGY_CRITERIA = {
+    TECHNOLOGY_CRITERIA = MappingProxyType({
         'innovation': {
             'weight': 0.4,
             'keywords': [
@@ -146,10 +161,10 @@ class Config:
                 'unique technology', '10x better', 'superior'
             ]
         }
-    }
+    })
     
     # Impact/ESG Evaluation Criteria
-    IMPACT_CRITERIA = {
+    IMPACT_CRITERIA = MappingProxyType({
         'social_impact': {
             'weight': 0.5,
             'keywords': [
@@ -164,20 +179,20 @@ class Config:
                 'ethical'
             ]
         }
-    }
+    })
     
     # Deal Flow Processing
-    DEALFLOW_CRITERIA = {
+    DEALFLOW_CRITERIA = MappingProxyType({
         'warm_intro_bonus': 0.2,
         'min_team_size': 2,
         'preferred_stages': ['seed', 'series a'],
         'follow_up_delay_days': 2
-    }
+    })
     
     # Market Intelligence Settings
-    MARKET_INTELLIGENCE = {
+    MARKET_INTELLIGENCE = MappingProxyType({
         'news_relevance_threshold': 0.6,
         'trend_detection_window_days': 30,
         'min_funding_amount_usd': 100000,
         'competitor_similarity_threshold': 0.7
-    } 
\ No newline at end of file
+    }) 
\ No newline at end of file
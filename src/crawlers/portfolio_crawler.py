@@ -1,23 +1,40 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from selectolax.parser import HTMLParser
 import requests
-import pandas as pd
 from typing import List, Dict
+import asyncio
+import os
+from functools import lru_cache
 import re
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+from multiprocessing.util import Finalize
+import ahocorasick
 
-# Download required NLTK data
-nltk.download('punkt')
-nltk.download('stopwords')
+from config.config import Config
+
+@lru_cache(maxsize=1)
+def _chromedriver_path() -> str:
+    """Resolve the ChromeDriver binary once per process"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    from webdriver_manager.core.driver_cache import DriverCacheManager
+    
+    # A persistent cache directory plus a long validity window lets a cached
+    # driver be reused across restarts without a version check
+    cache_manager = DriverCacheManager(
+        root_dir=os.getenv('WDM_CACHE_DIR'),
+        valid_range=30
+    )
+    return ChromeDriverManager(
+        driver_version=os.getenv('CHROMEDRIVER_VERSION'),
+        cache_manager=cache_manager
+    ).install()
 
 class PortfolioCrawler:
     def __init__(self):
-        self.setup_selenium()
+        # Chrome is only started for pages that need JavaScript rendering
+        self.driver = None
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (compatible; MCP-Server portfolio crawler)'
+        })
         self.sector_keywords = {
             'climate_tech': ['climate', 'renewable', 'sustainability', 'clean energy', 'carbon'],
             'health_tech': ['healthcare', 'medical', 'biotech', 'health', 'pharma'],
@@ -25,41 +42,111 @@ class PortfolioCrawler:
             'saas': ['software service', 'cloud', 'platform', 'subscription'],
             # Add more sectors and keywords as needed
         }
+        self._build_sector_automaton()
 
     def setup_selenium(self):
         """Setup Selenium WebDriver with Chrome"""
+        self.driver = self._create_driver()
+
+    def _create_driver(self):
+        """Start a headless Chrome WebDriver"""
+        # Imported lazily: selenium and webdriver_manager are slow to import
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        
         chrome_options = Options()
         chrome_options.add_argument('--headless')
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         
-        self.driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
+        return webdriver.Chrome(
+            service=Service(_chromedriver_path()),
             options=chrome_options
         )
 
-    def extract_portfolio_data(self, url: str) -> List[Dict]:
+    def extract_portfolio_data(self, url: str, render_js: bool = False) -> List[Dict]:
         """Extract portfolio company data from a given URL"""
+        if not render_js:
+            companies = self._extract_with(None, url)
+            if companies:
+                return companies
+            # No company cards in the static HTML; the page likely builds them
+            # with JavaScript, so fall back to rendering it in Chrome
+        
+        if self.driver is None:
+            self.setup_selenium()
+        return self._extract_with(self.driver, url)
+
+    async def extract_many(self, urls: List[str], render_js: bool = False,
+                           pool_size: int = 4) -> List[List[Dict]]:
+        """Extract portfolio company data from several URLs concurrently"""
+        if not render_js:
+            results = await asyncio.gather(*(
+                asyncio.to_thread(self._extract_with, None, url) for url in urls
+            ))
+            
+            # Render only the pages whose static HTML had no company cards
+            empty = [i for i, companies in enumerate(results) if not companies]
+            if empty:
+                rendered = await self.extract_many(
+                    [urls[i] for i in empty], render_js=True, pool_size=pool_size
+                )
+                for i, companies in zip(empty, rendered):
+                    results[i] = companies
+            return results
+        
+        # A browser renders one page at a time, so check drivers out of a small pool
+        started = await asyncio.gather(*(
+            asyncio.to_thread(self._create_driver) for _ in range(min(pool_size, len(urls)))
+        ), return_exceptions=True)
+        drivers = [driver for driver in started if not isinstance(driver, BaseException)]
+        
+        # If any browser failed to start, quit the ones that did before raising
+        errors = [driver for driver in started if isinstance(driver, BaseException)]
+        if errors:
+            for driver in drivers:
+                driver.quit()
+            raise errors[0]
+        
+        pool = asyncio.Queue()
+        for driver in drivers:
+            pool.put_nowait(driver)
+        
+        async def work(url: str) -> List[Dict]:
+            driver = await pool.get()
+            try:
+                return await asyncio.to_thread(self._extract_with, driver, url)
+            finally:
+                pool.put_nowait(driver)
+        
+        try:
+            return await asyncio.gather(*(work(url) for url in urls))
+        finally:
+            for driver in drivers:
+                driver.quit()
+
+    def _extract_with(self, driver, url: str) -> List[Dict]:
+        """Extract portfolio company data, rendering with driver or fetching over HTTP if None"""
         try:
-            self.driver.get(url)
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
+            page_source = self._fetch_page(url, driver)
+            tree = HTMLParser(page_source)
             
             # This is a basic implementation - you'll need to customize the selectors
             # based on the specific website structure
             companies = []
             
             # Example: finding company cards/sections
-            company_elements = soup.find_all('div', class_='company-card')
+            company_elements = tree.css('div.company-card')
             
             for element in company_elements:
                 company_data = {
-                    'name': self._extract_text(element.find('h2')),
-                    'description': self._extract_text(element.find('p', class_='description')),
-                    'founders': self._extract_text(element.find('div', class_='founders')),
-                    'problem': self._extract_text(element.find('div', class_='problem')),
-                    'solution': self._extract_text(element.find('div', class_='solution')),
-                    'usp': self._extract_text(element.find('div', class_='usp')),
+                    'name': self._extract_text(element.css_first('h2')),
+                    'description': self._extract_text(element.css_first('p.description')),
+                    'founders': self._extract_text(element.css_first('div.founders')),
+                    'problem': self._extract_text(element.css_first('div.problem')),
+                    'solution': self._extract_text(element.css_first('div.solution')),
+                    'usp': self._extract_text(element.css_first('div.usp')),
                 }
                 
                 # Add sector tags
@@ -75,27 +162,87 @@ class PortfolioCrawler:
             print(f"Error crawling {url}: {str(e)}")
             return []
 
-    def _extract_text(self, element) -> str:
-        """Safely extract text from a BeautifulSoup element"""
-        return element.get_text(strip=True) if element else ""
+    def _fetch_page(self, url: str, driver) -> str:
+        """Fetch page HTML, using a Selenium driver only when JavaScript must run"""
+        if driver is None:
+            response = self.session.get(url, timeout=Config.CRAWLER_TIMEOUT)
+            response.raise_for_status()
+            return response.text
+        
+        driver.get(url)
+        return driver.page_source
+
+    def _extract_text(self, node) -> str:
+        """Safely extract text from a selectolax node"""
+        return node.text(strip=True) if node else ""
 
-    def _identify_sectors(self, text: str) -> Dict[str, bool]:
-        """Identify relevant sectors based on text content"""
-        text = text.lower()
-        sectors = {}
+    def _build_sector_automaton(self):
+        """Compile all sector keywords into a single Aho-Corasick automaton"""
+        keywords = dict.fromkeys(
+            keyword.lower() for sector_keywords in self.sector_keywords.values()
+            for keyword in sector_keywords
+        )
         
-        for sector, keywords in self.sector_keywords.items():
-            sectors[sector] = any(keyword.lower() in text for keyword in keywords)
+        # Each distinct keyword gets one bit, so a text's hits collapse into
+        # a single integer mask and each sector test is one AND
+        self._kw_bits = {keyword: 1 << i for i, keyword in enumerate(keywords)}
+        
+        self._sector_masks = {}
+        self._sector_sizes = {}
+        for sector, sector_keywords in self.sector_keywords.items():
+            mask = 0
+            for keyword in sector_keywords:
+                mask |= self._kw_bits[keyword.lower()]
+            self._sector_masks[sector] = mask
+            self._sector_sizes[sector] = bin(mask).count("1")
+        
+        self._ac = ahocorasick.Automaton()
+        for keyword, bit in self._kw_bits.items():
+            self._ac.add_word(keyword, bit)
+        self._ac.make_automaton()
+
+    def _identify_sectors(self, text: str) -> Dict[str, float]:
+        """Score each sector from 0 to 1 by the share of its keywords found in the text"""
+        # Single pass over the text; repeated keyword hits set the same bit
+        hits = 0
+        for _, bit in self._ac.iter(text.lower()):
+            hits |= bit
         
-        return sectors
+        return {
+            sector: bin(hits & mask).count("1") / self._sector_sizes[sector]
+            for sector, mask in self._sector_masks.items()
+        }
 
     def close(self):
-        """Close the Selenium WebDriver"""
-        self.driver.quit()
+        """Close the Selenium WebDriver and HTTP session"""
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+        self.session.close()
 
-    def __del__(self):
-        """Destructor to ensure WebDriver is closed"""
-        try:
-            self.close()
-        except:
-            pass 
\ No newline at end of file
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        """Ensure WebDriver is closed when leaving a with-block"""
+        self.close()
+
+# Crawler owned by the current worker process. A module-level entry point
+# can be submitted to a ProcessPoolExecutor, whereas a crawler instance
+# (WebDriver, session) cannot be pickled.
+_process_crawler = None
+
+def init_process_crawler():
+    """Create this worker process's crawler and close it when the process exits"""
+    global _process_crawler
+    if _process_crawler is not None:
+        return
+    _process_crawler = PortfolioCrawler()
+    # Pool workers leave via os._exit, which skips atexit handlers, but
+    # multiprocessing still runs its own finalizers on the way out
+    Finalize(_process_crawler, _process_crawler.close, exitpriority=10)
+
+def crawl_portfolio_url(url: str, render_js: bool = False) -> List[Dict]:
+    """Crawl one portfolio page with a crawler reused across calls in this process"""
+    init_process_crawler()
+    return _process_crawler.extract_portfolio_data(url, render_js)
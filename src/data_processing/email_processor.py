@@ -1,13 +1,32 @@
 import email
+import email.policy
 import imaplib
 import os
 from typing import Dict, List
 from datetime import datetime, timedelta
 import re
 from email.utils import parseaddr
-import nltk
-from nltk.tokenize import sent_tokenize
-from nltk.corpus import stopwords
+from selectolax.parser import HTMLParser
+
+# Company name patterns, compiled once at import time
+_NAME_PATTERNS = [
+    re.compile(pattern) for pattern in (
+        r'(?i)introducing\s+([A-Z][A-Za-z0-9]+)',
+        r'(?i)company:\s+([A-Z][A-Za-z0-9]+)',
+        r'(?i)startup:\s+([A-Z][A-Za-z0-9]+)',
+        r'(?i)([A-Z][A-Za-z0-9]+)\s+is raising'
+    )
+]
+
+# Subjects of introductions and forwards, which often name no company or
+# stage (e.g. "Intro: Jane <> John", "Fwd: quick question")
+_INTRO_SUBJECT_RE = re.compile(r'\b(?:intro(?:duction|ducing)?|fwd?)\b|<>', re.IGNORECASE)
+
+def _compile_alternation(phrases: List[str]) -> re.Pattern:
+    """Compile a list of phrases into one case-insensitive alternation regex"""
+    # Longest first, so overlapping phrases prefer the most specific match
+    ordered = sorted(phrases, key=len, reverse=True)
+    return re.compile('|'.join(map(re.escape, ordered)), re.IGNORECASE)
 
 class EmailProcessor:
     def __init__(self):
@@ -15,10 +34,6 @@ class EmailProcessor:
         self.email = os.getenv('EMAIL_ADDRESS')
         self.password = os.getenv('EMAIL_PASSWORD')
         
-        # Download required NLTK data
-        nltk.download('punkt')
-        nltk.download('stopwords')
-        
         self.startup_indicators = [
             'startup', 'company', 'venture', 'founding', 'raised',
             'seed', 'series', 'pre-seed', 'angel'
@@ -28,6 +43,20 @@ class EmailProcessor:
             'pre-seed', 'seed', 'series a', 'series b', 'series c',
             'growth', 'late stage'
         ]
+        
+        self.warm_indicators = [
+            'introducing you to',
+            'wanted to connect you with',
+            'thought you might be interested in',
+            'recommended I reach out',
+            'mutual connection'
+        ]
+        
+        # One compiled matcher per keyword list, so each check is a single
+        # pass over the text without lowercasing it first
+        self._startup_re = _compile_alternation(self.startup_indicators)
+        self._stage_re = _compile_alternation(self.funding_stages)
+        self._warm_re = _compile_alternation(self.warm_indicators)
 
     def process_daily_dealflow(self) -> List[Dict]:
         """Process last 24 hours of emails for deal flow"""
@@ -42,38 +71,66 @@ class EmailProcessor:
         date = (datetime.now() - timedelta(days=1)).strftime("%d-%b-%Y")
         _, messages = mail.search(None, f'(SINCE {date})')
         
-        for msg_id in messages[0].split():
-            _, msg_data = mail.fetch(msg_id, '(RFC822)')
-            email_body = msg_data[0][1]
-            email_message = email.message_from_bytes(email_body)
-            
-            # Process email content
-            deal = self._extract_deal_info(email_message)
-            if deal:
-                deals.append(deal)
+        # Only download full bodies for messages whose subject looks relevant
+        msg_ids = self._prefilter_by_subject(mail, messages[0].split())
+        if msg_ids:
+            # Fetch all messages in a single round-trip; imaplib returns
+            # (envelope, body) tuples interleaved with b')' separators
+            _, msg_data = mail.fetch(b','.join(msg_ids), '(RFC822)')
+            for response_part in msg_data:
+                if not isinstance(response_part, tuple):
+                    continue
+                email_message = email.message_from_bytes(response_part[1])
+                
+                # Process email content
+                deal = self._extract_deal_info(email_message)
+                if deal:
+                    deals.append(deal)
         
         mail.close()
         mail.logout()
         
         return deals
 
+    def _prefilter_by_subject(self, mail: imaplib.IMAP4, msg_ids: List[bytes]) -> List[bytes]:
+        """Return IDs of messages whose subject suggests deal flow, fetching headers only"""
+        if not msg_ids:
+            return []
+        
+        # BODY.PEEK leaves the \Seen flag untouched on messages filtered out here
+        _, header_data = mail.fetch(b','.join(msg_ids), '(BODY.PEEK[HEADER.FIELDS (SUBJECT)])')
+        
+        candidates = []
+        for response_part in header_data:
+            if not isinstance(response_part, tuple):
+                continue
+            headers = email.message_from_bytes(response_part[1], policy=email.policy.default)
+            subject = str(headers['subject'] or '')
+            if self._is_candidate_subject(subject):
+                # The envelope starts with the message sequence number
+                candidates.append(response_part[0].split()[0])
+        
+        return candidates
+
+    def _is_candidate_subject(self, subject: str) -> bool:
+        """Check whether a subject could belong to a deal, including warm intros and forwards"""
+        return bool(
+            self._startup_re.search(subject)
+            or self._warm_re.search(subject)
+            or _INTRO_SUBJECT_RE.search(subject)
+            or any(pattern.search(subject) for pattern in _NAME_PATTERNS)
+        )
+
     def _extract_deal_info(self, email_message) -> Dict:
         """Extract relevant deal information from email"""
         subject = email_message['subject']
         sender = parseaddr(email_message['from'])[1]
         
         # Get email body
-        body = ""
-        if email_message.is_multipart():
-            for part in email_message.walk():
-                if part.get_content_type() == "text/plain":
-                    body = part.get_payload(decode=True).decode()
-                    break
-        else:
-            body = email_message.get_payload(decode=True).decode()
+        body = self._get_body(email_message)
         
         # Skip if no startup indicators found
-        if not any(indicator in body.lower() for indicator in self.startup_indicators):
+        if not self._startup_re.search(body):
             return None
         
         # Extract information
@@ -93,18 +150,40 @@ class EmailProcessor:
             'raw_content': body
         }
 
+    def _get_body(self, email_message) -> str:
+        """Get the plain-text email body, falling back to the HTML part as text"""
+        html_part = None
+        for part in email_message.walk():
+            content_type = part.get_content_type()
+            if content_type == "text/plain":
+                return self._decode_part(part)
+            if content_type == "text/html" and html_part is None:
+                html_part = part
+        
+        if html_part is None:
+            return ""
+        
+        tree = HTMLParser(self._decode_part(html_part))
+        tree.strip_tags(['script', 'style'])
+        return tree.text(separator=' ', strip=True)
+
+    def _decode_part(self, part) -> str:
+        """Decode a MIME part using its declared charset"""
+        raw = part.get_payload(decode=True) or b''
+        charset = part.get_content_charset() or 'utf-8'
+        try:
+            return raw.decode(charset, errors='replace')
+        except LookupError:
+            # Unknown charset name in the header
+            return raw.decode('utf-8', errors='replace')
+
     def _extract_company_name(self, subject: str, body: str) -> str:
         """Extract company name from email"""
-        # Try to find company name in common patterns
-        patterns = [
-            r'(?i)introducing\s+([A-Z][A-Za-z0-9]+)',
-            r'(?i)company:\s+([A-Z][A-Za-z0-9]+)',
-            r'(?i)startup:\s+([A-Z][A-Za-z0-9]+)',
-            r'(?i)([A-Z][A-Za-z0-9]+)\s+is raising'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, subject + " " + body)
+        # Try to find company name in common patterns, checking the
+        # (short) subject before the body
+        subject = subject or ""
+        for pattern in _NAME_PATTERNS:
+            match = pattern.search(subject) or pattern.search(body)
             if match:
                 return match.group(1)
         
@@ -112,11 +191,8 @@ class EmailProcessor:
 
     def _extract_funding_stage(self, text: str) -> str:
         """Extract funding stage from text"""
-        text = text.lower()
-        for stage in self.funding_stages:
-            if stage in text:
-                return stage
-        return 'unknown'
+        match = self._stage_re.search(text)
+        return match.group(0).lower() if match else 'unknown'
 
     def _extract_sectors(self, text: str) -> List[str]:
         """Extract sector information from text"""
@@ -137,13 +213,4 @@ class EmailProcessor:
 
     def _is_warm_intro(self, text: str) -> bool:
         """Determine if this is a warm introduction"""
-        warm_indicators = [
-            'introducing you to',
-            'wanted to connect you with',
-            'thought you might be interested in',
-            'recommended I reach out',
-            'mutual connection'
-        ]
-        
-        text = text.lower()
-        return any(indicator in text for indicator in warm_indicators) 
\ No newline at end of file
+        return self._warm_re.search(text) is not None 
\ No newline at end of file
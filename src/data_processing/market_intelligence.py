@@ -1,10 +1,30 @@
 import os
-from typing import Dict, List
-import requests
+import asyncio
+import copy
+from collections import Counter
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Hashable, List, Tuple
+import aiohttp
+from cachetools import TTLCache
 from datetime import datetime, timedelta
 import json
-from nltk.tokenize import sent_tokenize
-import pandas as pd
+
+from config.config import Config
+
+@dataclass(frozen=True)
+class NewsItem:
+    """A news article matched to a monitored sector keyword"""
+    # Explicit slots (dataclass(slots=True) needs Python 3.10) keep each of
+    # the potentially thousands of articles free of a per-instance dict
+    __slots__ = ('sector', 'keyword', 'title', 'description', 'url', 'published_at', 'source')
+    
+    sector: str
+    keyword: str
+    title: str
+    description: str
+    url: str
+    published_at: str
+    source: str
 
 class MarketIntelligence:
     def __init__(self):
@@ -19,53 +39,142 @@ class MarketIntelligence:
             'healthtech': ['digital health', 'biotech', 'healthcare', 'medtech'],
             'climate': ['climate tech', 'clean energy', 'sustainability', 'carbon']
         }
+        
+        # Shared keep-alive HTTP session, created lazily inside the event loop
+        self._session = None
+        
+        # Upstream results stay fresh for one scan interval
+        self._news_cache = TTLCache(maxsize=64, ttl=Config.MARKET_SCAN_INTERVAL)
+        self._funding_cache = TTLCache(maxsize=1, ttl=Config.MARKET_SCAN_INTERVAL)
+        self._company_cache = TTLCache(maxsize=256, ttl=Config.COMPANY_INSIGHTS_CACHE_TTL)
+        
+        # Loads currently running per (cache, key), so concurrent misses share one
+        self._in_flight = {}
 
     async def gather_market_insights(self) -> Dict:
         """Gather market insights from various sources"""
+        # The three sources are independent, so fetch them concurrently
+        news, social_trends, funding_data = await asyncio.gather(
+            self._fetch_news(),
+            self._fetch_social_trends(),
+            self._fetch_funding_data()
+        )
         insights = {
-            'news': await self._fetch_news(),
-            'social_trends': await self._fetch_social_trends(),
-            'funding_data': await self._fetch_funding_data(),
-            'market_trends': await self._analyze_market_trends()
+            'news': news,
+            'social_trends': social_trends,
+            'funding_data': funding_data,
+            'market_trends': await self._analyze_market_trends(news, funding_data)
         }
         return insights
 
-    async def _fetch_news(self) -> List[Dict]:
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32),
+                timeout=aiohttp.ClientTimeout(total=Config.CRAWLER_TIMEOUT)
+            )
+        return self._session
+
+    async def _get_json(self, url: str, params: Dict, headers: Dict = None) -> Dict:
+        """GET a JSON resource, retrying connection errors with backoff"""
+        session = await self._get_session()
+        for attempt in range(Config.MAX_RETRIES + 1):
+            try:
+                async with session.get(url, params=params, headers=headers) as response:
+                    response.raise_for_status()
+                    return await response.json()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == Config.MAX_RETRIES:
+                    raise
+                await asyncio.sleep(0.3 * 2 ** attempt)
+
+    async def _cached(self, cache: TTLCache, key: Hashable, load: Callable[[], Awaitable]):
+        """Get a cached value, running one load per key however many callers miss at once"""
+        if key in cache:
+            return cache[key]
+        
+        flight_key = (id(cache), key)
+        task = self._in_flight.get(flight_key)
+        if task is None:
+            async def load_and_store():
+                value = await load()
+                # Errors are logged and yield empty results, so don't pin those
+                if value:
+                    cache[key] = value
+                return value
+            
+            task = asyncio.ensure_future(load_and_store())
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(flight_key, None))
+        
+        # Shielded so one caller being cancelled doesn't cancel the others' load
+        return await asyncio.shield(task)
+
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _fetch_news(self) -> Tuple[NewsItem, ...]:
         """Fetch relevant news articles"""
+        key = tuple((sector, tuple(keywords)) for sector, keywords in sorted(self.monitored_sectors.items()))
+        # A tuple of frozen items, so callers can share the cached result safely
+        return await self._cached(self._news_cache, key, self._load_news)
+
+    async def _load_news(self) -> Tuple[NewsItem, ...]:
+        """Fetch news for every monitored keyword"""
+        # Issue one request per keyword concurrently
+        results = await asyncio.gather(*(
+            self._fetch_keyword_news(sector, keyword)
+            for sector, keywords in self.monitored_sectors.items()
+            for keyword in keywords
+        ))
+        
+        return tuple(item for items in results for item in items)
+
+    async def _fetch_keyword_news(self, sector: str, keyword: str) -> List[NewsItem]:
+        """Fetch news articles for a single sector keyword"""
         news_items = []
+        url = f"https://newsapi.org/v2/everything"
+        params = {
+            'q': keyword,
+            'from': (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'),
+            'sortBy': 'relevancy',
+            'apiKey': self.news_api_key
+        }
         
-        for sector, keywords in self.monitored_sectors.items():
-            for keyword in keywords:
-                url = f"https://newsapi.org/v2/everything"
-                params = {
-                    'q': keyword,
-                    'from': (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'),
-                    'sortBy': 'relevancy',
-                    'apiKey': self.news_api_key
-                }
-                
-                try:
-                    response = requests.get(url, params=params)
-                    response.raise_for_status()
-                    articles = response.json().get('articles', [])
-                    
-                    for article in articles:
-                        news_items.append({
-                            'sector': sector,
-                            'keyword': keyword,
-                            'title': article['title'],
-                            'description': article['description'],
-                            'url': article['url'],
-                            'published_at': article['publishedAt'],
-                            'source': article['source']['name']
-                        })
-                except Exception as e:
-                    print(f"Error fetching news for {keyword}: {str(e)}")
+        try:
+            articles = (await self._get_json(url, params)).get('articles', [])
+            
+            for article in articles:
+                news_items.append(NewsItem(
+                    sector=sector,
+                    keyword=keyword,
+                    title=article['title'],
+                    description=article['description'],
+                    url=article['url'],
+                    published_at=article['publishedAt'],
+                    source=article['source']['name']
+                ))
+        except Exception as e:
+            print(f"Error fetching news for {keyword}: {str(e)}")
         
         return news_items
 
     async def _fetch_social_trends(self) -> List[Dict]:
         """Fetch relevant social media trends"""
+        # Issue one request per sector concurrently
+        results = await asyncio.gather(*(
+            self._fetch_sector_social(sector, keywords)
+            for sector, keywords in self.monitored_sectors.items()
+        ))
+        
+        return [trend for trends in results for trend in trends]
+
+    async def _fetch_sector_social(self, sector: str, keywords: List[str]) -> List[Dict]:
+        """Fetch recent tweets matching a single sector's keywords"""
         trends = []
         
         # Twitter API v2 endpoint
@@ -73,34 +182,34 @@ class MarketIntelligence:
         headers = {
             "Authorization": f"Bearer {self.twitter_bearer_token}"
         }
+        params = {
+            'query': ' OR '.join(keywords),
+            'tweet.fields': 'public_metrics,created_at',
+            'max_results': 100
+        }
         
-        for sector, keywords in self.monitored_sectors.items():
-            query = ' OR '.join(keywords)
-            params = {
-                'query': query,
-                'tweet.fields': 'public_metrics,created_at',
-                'max_results': 100
-            }
+        try:
+            tweets = (await self._get_json(url, params, headers)).get('data', [])
             
-            try:
-                response = requests.get(url, headers=headers, params=params)
-                response.raise_for_status()
-                tweets = response.json().get('data', [])
-                
-                for tweet in tweets:
-                    trends.append({
-                        'sector': sector,
-                        'content': tweet['text'],
-                        'engagement': tweet['public_metrics'],
-                        'created_at': tweet['created_at']
-                    })
-            except Exception as e:
-                print(f"Error fetching social trends for {sector}: {str(e)}")
+            for tweet in tweets:
+                trends.append({
+                    'sector': sector,
+                    'content': tweet['text'],
+                    'engagement': tweet['public_metrics'],
+                    'created_at': tweet['created_at']
+                })
+        except Exception as e:
+            print(f"Error fetching social trends for {sector}: {str(e)}")
         
         return trends
 
     async def _fetch_funding_data(self) -> List[Dict]:
         """Fetch recent funding data"""
+        # Copied so a caller mutating its rounds can't change the cached ones
+        return copy.deepcopy(await self._cached(self._funding_cache, 'rounds', self._load_funding_data))
+
+    async def _load_funding_data(self) -> List[Dict]:
+        """Fetch funding rounds announced in the last week"""
         funding_rounds = []
         
         # Crunchbase API endpoint
@@ -114,9 +223,7 @@ class MarketIntelligence:
         }
         
         try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            rounds = response.json().get('data', {}).get('items', [])
+            rounds = (await self._get_json(url, params, headers)).get('data', {}).get('items', [])
             
             for round_data in rounds:
                 funding_rounds.append({
@@ -131,8 +238,8 @@ class MarketIntelligence:
         
         return funding_rounds
 
-    async def _analyze_market_trends(self) -> Dict:
-        """Analyze market trends from collected data"""
+    async def _analyze_market_trends(self, news: Tuple[NewsItem, ...], funding_data: List[Dict]) -> Dict:
+        """Analyze market trends from already collected news and funding data"""
         trends = {
             'sector_momentum': {},
             'emerging_topics': {},
@@ -140,22 +247,29 @@ class MarketIntelligence:
         }
         
         # Calculate sector momentum
-        news_df = pd.DataFrame(await self._fetch_news())
-        if not news_df.empty:
-            sector_counts = news_df['sector'].value_counts()
-            for sector in sector_counts.index:
-                trends['sector_momentum'][sector] = {
-                    'news_volume': int(sector_counts[sector]),
-                    'trend': self._calculate_trend(sector)
-                }
-        
-        # Analyze funding patterns
-        funding_df = pd.DataFrame(await self._fetch_funding_data())
-        if not funding_df.empty:
+        sector_counts = Counter(item.sector for item in news)
+        for sector, volume in sector_counts.most_common():
+            trends['sector_momentum'][sector] = {
+                'news_volume': volume,
+                'trend': self._calculate_trend(sector)
+            }
+        
+        # Analyze funding patterns in a single pass over the rounds
+        if funding_data:
+            amounts = []
+            investor_counts = Counter()
+            stage_counts = Counter()
+            for round_data in funding_data:
+                if round_data['amount'] is not None:
+                    amounts.append(round_data['amount'])
+                investor_counts.update(round_data['investors'])
+                if round_data['series'] is not None:
+                    stage_counts[round_data['series']] += 1
+            
             trends['investment_patterns'] = {
-                'average_round_size': funding_df['amount'].mean(),
-                'most_active_investors': funding_df['investors'].explode().value_counts().head(5).to_dict(),
-                'stage_distribution': funding_df['series'].value_counts().to_dict()
+                'average_round_size': sum(amounts) / len(amounts) if amounts else None,
+                'most_active_investors': dict(investor_counts.most_common(5)),
+                'stage_distribution': dict(stage_counts.most_common())
             }
         
         return trends
@@ -168,13 +282,19 @@ class MarketIntelligence:
 
     async def get_company_insights(self, company_name: str) -> Dict:
         """Get comprehensive insights for a specific company"""
-        insights = {
+        insights = await self._cached(
+            self._company_cache, company_name, lambda: self._load_company_insights(company_name)
+        )
+        return copy.deepcopy(insights)
+
+    async def _load_company_insights(self, company_name: str) -> Dict:
+        """Collect news, social, competitor and positioning data for a company"""
+        return {
             'news': await self._fetch_company_news(company_name),
             'social_mentions': await self._fetch_company_social(company_name),
             'competitors': await self._identify_competitors(company_name),
             'market_position': await self._analyze_market_position(company_name)
         }
-        return insights
 
     async def _fetch_company_news(self, company_name: str) -> List[Dict]:
         """Fetch news specific to a company"""
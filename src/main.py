@@ -1,19 +1,26 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
+from fastapi.responses import ORJSONResponse
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from config.config import load_env
+import asyncio
+import multiprocessing
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Dict, List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
 from src.utils.affinity_client import AffinityClient
-from src.crawlers.portfolio_crawler import PortfolioCrawler
+from src.crawlers.portfolio_crawler import crawl_portfolio_url, init_process_crawler
 from src.models.scoring import CompanyScorer
 from src.data_processing.email_processor import EmailProcessor
 from src.data_processing.market_intelligence import MarketIntelligence
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 # Affinity Configuration
 AFFINITY_API_KEY=os.getenv("AFFINITY_API_KEY")
@@ -33,13 +40,108 @@ CRUNCHBASE_API_KEY=os.getenv("CRUNCHBASE_API_KEY")
 # Server Configuration
 PORT=int(os.getenv("PORT", 8000))
 
+# Crawler Configuration (number of crawl worker processes)
+CRAWL_WORKERS=int(os.getenv("CRAWL_WORKERS", 8))
+
+# Response Cache Configuration (caching is disabled when unset)
+REDIS_URL=os.getenv("REDIS_URL")
+
+# Cached read-only GET endpoints: (path prefix, TTL in seconds)
+RESPONSE_CACHE_TTLS = (
+    ("/incubators", 300),
+    ("/portfolio/", 120),
+    ("/market-insights", 60),
+    ("/company-insights/", 300),
+)
+
 app = FastAPI(
     title="Model Context Protocol Server",
     description="Automated outbound sourcing and investment opportunity analysis",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# Configure CORS
+# Initialize clients
+company_scorer = CompanyScorer()
+email_processor = EmailProcessor()
+market_intelligence = MarketIntelligence()
+
+@app.on_event("startup")
+async def startup():
+    # Async clients own connection pools, so build them once per app
+    app.state.affinity_client = AffinityClient()
+    app.state.redis = aioredis.Redis.from_url(REDIS_URL) if REDIS_URL else None
+    
+    # Crawl workers are processes because each owns a crawler (session,
+    # possibly Chrome) that can't be pickled or shared with this process,
+    # and so HTML parsing stays off the event loop's GIL. A crawl mostly
+    # waits on the network, so CRAWL_WORKERS rather than the CPU count
+    # sizes the pool. Spawn rather than fork: this process already runs
+    # executor threads, and forking with their locks held can deadlock
+    # the children
+    app.state.pool = ProcessPoolExecutor(
+        max_workers=CRAWL_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_process_crawler
+    )
+    
+    # Scoring runs on asyncio.to_thread, which uses the loop's default executor
+    app.state.threads = ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) * 2))
+    asyncio.get_running_loop().set_default_executor(app.state.threads)
+
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.pool.shutdown(wait=False, cancel_futures=True)
+    app.state.threads.shutdown(wait=False, cancel_futures=True)
+    await market_intelligence.close()
+    await app.state.affinity_client.aclose()
+    if app.state.redis is not None:
+        await app.state.redis.aclose()
+
+def get_affinity_client(request: Request) -> AffinityClient:
+    return request.app.state.affinity_client
+
+def _response_cache_ttl(path: str) -> Optional[int]:
+    """Get the response cache TTL for a path, or None if it isn't cached"""
+    for prefix, ttl in RESPONSE_CACHE_TTLS:
+        if path == prefix or (prefix.endswith("/") and path.startswith(prefix)):
+            return ttl
+    return None
+
+@app.middleware("http")
+async def response_cache(request: Request, call_next):
+    """Serve cached JSON for slow read-only endpoints from Redis"""
+    # Unset until startup has run
+    redis = getattr(request.app.state, "redis", None)
+    ttl = _response_cache_ttl(request.url.path)
+    if request.method != "GET" or ttl is None or redis is None:
+        return await call_next(request)
+    
+    key = f"mcp:{request.url.path}?{request.url.query}"
+    try:
+        cached = await redis.get(key)
+    except RedisError:
+        cached = None
+    if cached is not None:
+        return Response(cached, media_type="application/json", headers={"X-Cache": "HIT"})
+    
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+    
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    try:
+        await redis.setex(key, ttl, body)
+    except RedisError as e:
+        print(f"Error caching response for {request.url.path}: {str(e)}")
+    
+    headers = dict(response.headers)
+    headers["X-Cache"] = "MISS"
+    return Response(body, status_code=response.status_code, headers=headers,
+                    media_type=response.media_type)
+
+# Configure CORS. Added after the response cache so it wraps it and
+# cache hits get CORS headers too
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -48,12 +150,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize clients
-affinity_client = AffinityClient()
-portfolio_crawler = PortfolioCrawler()
-company_scorer = CompanyScorer()
-email_processor = EmailProcessor()
-market_intelligence = MarketIntelligence()
+async def _invalidate_cache(prefix: str) -> int:
+    """Delete cached responses whose path starts with prefix"""
+    redis = getattr(app.state, "redis", None)
+    if redis is None:
+        return 0
+    
+    # Escape glob metacharacters so names containing them match literally
+    pattern = re.sub(r'([\\*?\[\]])', r'\\\1', prefix)
+    keys = [key async for key in redis.scan_iter(match=f"mcp:{pattern}*")]
+    if keys:
+        await redis.delete(*keys)
+    return len(keys)
 
 class ThesisInput(BaseModel):
     thesis_text: str
@@ -103,42 +211,50 @@ async def get_company_insights(company_name: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/incubators")
-async def get_incubators():
+async def get_incubators(affinity_client: AffinityClient = Depends(get_affinity_client)):
     """Get list of all incubators from the database"""
     try:
-        df = affinity_client.get_incubators_data()
-        return {"incubators": df.to_dict('records')}
+        incubators = await affinity_client.get_incubators_records()
+        return {"incubators": incubators}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/crawl-portfolio/{incubator_name}")
-async def crawl_portfolio(incubator_name: str, background_tasks: BackgroundTasks):
-    """Crawl portfolio data for a specific incubator"""
+async def crawl_portfolio(incubator_name: str, background_tasks: BackgroundTasks,
+                          render_js: bool = False,
+                          affinity_client: AffinityClient = Depends(get_affinity_client)):
+    """Crawl portfolio data for a specific incubator, rendering in Chrome if render_js is set"""
     try:
         # Get incubator URL from database
-        df = affinity_client.get_incubators_data()
-        incubator = df[df['name'] == incubator_name].iloc[0]
+        incubator = await affinity_client.get_incubator(incubator_name)
+        if not incubator:
+            raise HTTPException(status_code=404, detail=f"Incubator {incubator_name} not found")
         
         # Add crawling task to background
         background_tasks.add_task(
             crawl_and_store_portfolio,
+            affinity_client,
             incubator_name,
-            incubator['portfolio_url']
+            incubator['portfolio_url'],
+            render_js
         )
         
         return {
             "message": f"Started crawling portfolio for {incubator_name}",
             "status": "processing"
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/portfolio/{incubator_name}")
-async def get_portfolio(incubator_name: str):
+async def get_portfolio(incubator_name: str,
+                        affinity_client: AffinityClient = Depends(get_affinity_client)):
     """Get portfolio data for a specific incubator"""
     try:
-        df = affinity_client.get_portfolio_data(incubator_name)
-        return {"portfolio": df.to_dict('records')}
+        portfolio = await affinity_client.get_portfolio_records(incubator_name)
+        return {"portfolio": portfolio}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -149,12 +265,13 @@ async def score_company(company: CompanyInput, thesis: Optional[ThesisInput] = N
         # Convert company input to dict
         company_data = company.dict()
         
-        # Get base scores
-        scores = company_scorer.score_company(company_data)
+        # Get base scores, off the event loop since scoring is CPU-bound
+        scores = await asyncio.to_thread(company_scorer.score_company, company_data)
         
         # Add thesis relevance if provided
         if thesis:
-            scores['thesis_relevance'] = company_scorer.calculate_thesis_relevance(
+            scores['thesis_relevance'] = await asyncio.to_thread(
+                company_scorer.calculate_thesis_relevance,
                 company_data,
                 thesis.thesis_text
             )
@@ -168,17 +285,20 @@ async def score_company(company: CompanyInput, thesis: Optional[ThesisInput] = N
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/investment-memo/{company_name}")
-async def generate_investment_memo(company_name: str):
+async def generate_investment_memo(company_name: str,
+                                   affinity_client: AffinityClient = Depends(get_affinity_client)):
     """Generate an investment committee memo"""
     try:
-        # Get company data
-        company_data = affinity_client.get_company_data(company_name)
-        
-        # Get market insights
-        market_data = await market_intelligence.get_company_insights(company_name)
+        # Company data and market insights are independent, so fetch them together
+        company_data, market_data = await asyncio.gather(
+            affinity_client.get_company_data(company_name),
+            market_intelligence.get_company_insights(company_name)
+        )
+        if not company_data:
+            raise HTTPException(status_code=404, detail=f"Company {company_name} not found")
         
-        # Get scoring
-        scores = company_scorer.score_company(company_data)
+        # Score off the event loop; it's CPU-bound
+        scores = await asyncio.to_thread(company_scorer.score_company, company_data)
         
         # Combine all data into memo format
         memo = {
@@ -186,13 +306,23 @@ async def generate_investment_memo(company_name: str):
             'market_analysis': market_data,
             'scoring': scores,
             'recommendation': _generate_recommendation(scores, market_data),
-            'generated_at': datetime.now().isoformat()
+            'generated_at': datetime.now()
         }
         
         return memo
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/admin/cache/invalidate")
+async def invalidate_cache(prefix: str = "/"):
+    """Invalidate cached responses for paths starting with prefix"""
+    try:
+        return {"invalidated": await _invalidate_cache(prefix)}
+    except RedisError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 def _generate_recommendation(scores: Dict, market_data: Dict) -> Dict:
     """Generate investment recommendation based on scores and market data"""
     # Implement recommendation logic
@@ -203,14 +333,27 @@ def _generate_recommendation(scores: Dict, market_data: Dict) -> Dict:
         'next_steps': []
     }
 
-async def crawl_and_store_portfolio(incubator_name: str, portfolio_url: str):
+async def crawl_and_store_portfolio(affinity_client: AffinityClient, incubator_name: str,
+                                    portfolio_url: str, render_js: bool = False):
     """Background task to crawl and store portfolio data"""
     try:
-        # Crawl portfolio data
-        portfolio_data = portfolio_crawler.extract_portfolio_data(portfolio_url)
+        # Crawl portfolio data in a worker process
+        portfolio_data = await asyncio.get_running_loop().run_in_executor(
+            app.state.pool, crawl_portfolio_url, portfolio_url, render_js
+        )
+        
+        # An empty crawl means the page couldn't be read, not that the
+        # portfolio is empty, so leave the stored data alone
+        if not portfolio_data:
+            print(f"No portfolio companies found for {incubator_name} at {portfolio_url}")
+            return
         
         # Store in Affinity
-        affinity_client.update_portfolio_data(incubator_name, portfolio_data)
+        await affinity_client.update_portfolio_data(incubator_name, portfolio_data)
+        
+        # Serve fresh data on the next read
+        affinity_client.invalidate_incubators()
+        await _invalidate_cache(f"/portfolio/{incubator_name}")
     except Exception as e:
         print(f"Error processing portfolio for {incubator_name}: {str(e)}")
 
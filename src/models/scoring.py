@@ -1,9 +1,22 @@
-from typing import Dict, List, Union
+from typing import Dict, Tuple, Union
+from collections import Counter
+import hashlib
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
+import ahocorasick
+from cachetools import LRUCache
+from sklearn.feature_extraction.text import HashingVectorizer
 import numpy as np
 
+# Company text fields the indicator scorers read
+TEXT_FIELDS = ('founders', 'description', 'problem', 'solution', 'usp')
+
+def _flat(value) -> str:
+    """Render a field as plain text, joining list values with spaces"""
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value)
+    return str(value or "")
+
 class CompanyScorer:
     def __init__(self):
         self.criteria_weights = {
@@ -68,16 +81,67 @@ class CompanyScorer:
                 'ethical'
             ]
         }
+        
+        self._build_indicator_automaton()
+        
+        # Stateless vectorizer: nothing to fit per call, so one instance is
+        # reused for every thesis comparison
+        self._hv = HashingVectorizer(
+            n_features=2**18, alternate_sign=False, norm='l2', stop_words='english'
+        )
+        # cachetools caches aren't thread-safe, and relevance is computed on
+        # executor threads, so every cache access goes through the lock
+        self._relevance_cache = LRUCache(maxsize=4096)
+        self._relevance_lock = threading.Lock()
+
+    def _build_indicator_automaton(self):
+        """Compile every indicator phrase into a single Aho-Corasick automaton"""
+        indicator_groups = {
+            'team': self.team_indicators,
+            'business': self.business_indicators,
+            'technology': self.technology_indicators,
+            'impact': self.impact_indicators
+        }
+        
+        # Normalize each category's phrases once; the automaton and the
+        # per-category divisors are both built from these tuples
+        self._indicators = {
+            (group, category): tuple(phrase.lower() for phrase in phrases)
+            for group, indicators in indicator_groups.items()
+            for category, phrases in indicators.items()
+        }
+        self._cat_sizes = {key: len(phrases) for key, phrases in self._indicators.items()}
+        
+        # A phrase may appear in several categories (e.g. 'breakthrough'),
+        # so each automaton entry carries every (group, category) it counts for
+        phrase_labels = {}
+        for key, phrases in self._indicators.items():
+            for phrase in phrases:
+                phrase_labels.setdefault(phrase, []).append(key)
+        
+        self._ac = ahocorasick.Automaton()
+        for phrase, labels in phrase_labels.items():
+            self._ac.add_word(phrase, (phrase, tuple(labels)))
+        self._ac.make_automaton()
 
     def score_company(self, company_data: Dict) -> Dict[str, Union[float, Dict[str, float]]]:
         """Score a company based on all criteria"""
         scores = {}
         
+        # Lowercase each text field once; the component scorers share them.
+        # List fields (e.g. founders) are joined so their repr's brackets and
+        # quotes don't end up in the matched text
+        fields = {field: _flat(company_data.get(field)).lower() for field in TEXT_FIELDS}
+        
+        # Scan each field once; description, usp and solution feed several
+        # component scores, which reuse these matches instead of rescanning
+        matches = {field: self._match_phrases(text) for field, text in fields.items()}
+        
         # Calculate individual component scores
-        scores['team'] = self._score_team(company_data)
-        scores['business'] = self._score_business(company_data)
-        scores['technology'] = self._score_technology(company_data)
-        scores['impact'] = self._score_impact(company_data)
+        scores['team'] = self._score_team(matches)
+        scores['business'] = self._score_business(matches)
+        scores['technology'] = self._score_technology(matches)
+        scores['impact'] = self._score_impact(matches)
         
         # Calculate weighted total score
         total_score = sum(
@@ -90,60 +154,84 @@ class CompanyScorer:
             'component_scores': scores
         }
 
-    def _calculate_indicator_score(self, text: str, indicators: List[str]) -> float:
-        """Calculate score based on presence of indicators in text"""
-        text = text.lower()
-        matches = sum(1 for indicator in indicators if indicator.lower() in text)
-        return min(matches / len(indicators), 1.0)
+    def _match_phrases(self, text: str) -> Dict[str, Tuple]:
+        """Find the distinct indicator phrases in lowercased text, with their labels"""
+        return {phrase: labels for _, (phrase, labels) in self._ac.iter(text)}
+
+    def _count_hits(self, matches: Dict[str, Dict], *field_names: str) -> Counter:
+        """Count distinct indicator phrases across fields per (group, category)"""
+        matched = {}
+        for field in field_names:
+            matched.update(matches[field])
+        hits = Counter()
+        for labels in matched.values():
+            hits.update(labels)
+        return hits
 
-    def _score_team(self, company_data: Dict) -> float:
+    def _indicator_score(self, hits: Counter, group: str, category: str) -> float:
+        """Calculate score as the share of a category's indicators that were found"""
+        key = (group, category)
+        return min(hits[key] / self._cat_sizes[key], 1.0)
+
+    def _score_team(self, matches: Dict[str, Dict]) -> float:
         """Score the team based on education, experience, and skills"""
-        text = f"{company_data.get('founders', '')} {company_data.get('description', '')}"
+        hits = self._count_hits(matches, 'founders', 'description')
         
-        education_score = self._calculate_indicator_score(text, self.team_indicators['education'])
-        experience_score = self._calculate_indicator_score(text, self.team_indicators['experience'])
-        skills_score = self._calculate_indicator_score(text, self.team_indicators['skills'])
+        education_score = self._indicator_score(hits, 'team', 'education')
+        experience_score = self._indicator_score(hits, 'team', 'experience')
+        skills_score = self._indicator_score(hits, 'team', 'skills')
         
         return (education_score + experience_score + skills_score) / 3
 
-    def _score_business(self, company_data: Dict) -> float:
+    def _score_business(self, matches: Dict[str, Dict]) -> float:
         """Score the business potential"""
-        text = f"{company_data.get('description', '')} {company_data.get('usp', '')}"
+        hits = self._count_hits(matches, 'description', 'usp')
         
-        market_score = self._calculate_indicator_score(text, self.business_indicators['market_size'])
-        growth_score = self._calculate_indicator_score(text, self.business_indicators['growth_potential'])
-        innovation_score = self._calculate_indicator_score(text, self.business_indicators['innovation'])
+        market_score = self._indicator_score(hits, 'business', 'market_size')
+        growth_score = self._indicator_score(hits, 'business', 'growth_potential')
+        innovation_score = self._indicator_score(hits, 'business', 'innovation')
         
         return (market_score + growth_score + innovation_score) / 3
 
-    def _score_technology(self, company_data: Dict) -> float:
+    def _score_technology(self, matches: Dict[str, Dict]) -> float:
         """Score the technology aspects"""
-        text = f"{company_data.get('solution', '')} {company_data.get('usp', '')}"
+        hits = self._count_hits(matches, 'solution', 'usp')
         
-        innovation_score = self._calculate_indicator_score(text, self.technology_indicators['innovation'])
-        feasibility_score = self._calculate_indicator_score(text, self.technology_indicators['feasibility'])
-        advantage_score = self._calculate_indicator_score(text, self.technology_indicators['competitive_advantage'])
+        innovation_score = self._indicator_score(hits, 'technology', 'innovation')
+        feasibility_score = self._indicator_score(hits, 'technology', 'feasibility')
+        advantage_score = self._indicator_score(hits, 'technology', 'competitive_advantage')
         
         return (innovation_score + feasibility_score + advantage_score) / 3
 
-    def _score_impact(self, company_data: Dict) -> float:
+    def _score_impact(self, matches: Dict[str, Dict]) -> float:
         """Score the impact and ESG aspects"""
-        text = f"{company_data.get('description', '')} {company_data.get('problem', '')} {company_data.get('solution', '')}"
+        hits = self._count_hits(matches, 'description', 'problem', 'solution')
         
-        impact_score = self._calculate_indicator_score(text, self.impact_indicators['social_impact'])
-        esg_score = self._calculate_indicator_score(text, self.impact_indicators['esg'])
+        impact_score = self._indicator_score(hits, 'impact', 'social_impact')
+        esg_score = self._indicator_score(hits, 'impact', 'esg')
         
         return (impact_score + esg_score) / 2
 
     def calculate_thesis_relevance(self, company_data: Dict, thesis_text: str) -> float:
         """Calculate relevance score based on investment thesis"""
-        company_text = f"{company_data.get('description', '')} {company_data.get('problem', '')} {company_data.get('solution', '')} {company_data.get('usp', '')}"
+        company_text = " ".join(
+            _flat(company_data.get(field)) for field in ('description', 'problem', 'solution', 'usp')
+        )
+        
+        # Key on a digest so the cache doesn't hold on to the full texts
+        key = hashlib.sha256(f"{thesis_text}\0{company_text}".encode()).digest()
+        with self._relevance_lock:
+            cached = self._relevance_cache.get(key)
+        if cached is not None:
+            return cached
         
-        # Create TF-IDF vectors
-        vectorizer = TfidfVectorizer()
+        # Rows are L2-normalized, so their dot product is the cosine similarity
         try:
-            tfidf_matrix = vectorizer.fit_transform([thesis_text, company_text])
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            return float(similarity)
-        except:
-            return 0.0 
\ No newline at end of file
+            matrix = self._hv.transform([thesis_text, company_text])
+            similarity = float(matrix[0].multiply(matrix[1]).sum())
+        except ValueError:
+            return 0.0
+        
+        with self._relevance_lock:
+            self._relevance_cache[key] = similarity
+        return similarity 
\ No newline at end of file
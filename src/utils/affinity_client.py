@@ -1,13 +1,57 @@
+import asyncio
 import os
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict, Optional
+import httpx
 import pandas as pd
-import requests
-from dotenv import load_dotenv
+from cachetools import TTLCache
+from tenacity import RetryCallState, retry, stop_after_attempt, wait_exponential_jitter
+from config.config import load_env
 
-load_dotenv()
+load_env()
+
+# Methods that are safe to resend after the server may already have acted
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+
+# Longest Retry-After we'll honor before trying again
+_MAX_RETRY_AFTER = 10
+
+_backoff = wait_exponential_jitter(initial=1, max=10)
+
+def _is_retryable(method: str, exc: BaseException) -> bool:
+    """Retry rate limits always; transport failures and server errors only when safe"""
+    if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429:
+        return True
+    if isinstance(exc, httpx.ConnectError):
+        # The request never reached the server
+        return True
+    if method.upper() not in _IDEMPOTENT_METHODS:
+        return False
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return False
+
+def _should_retry(retry_state: RetryCallState) -> bool:
+    """Tenacity predicate: retry _request(self, method, url) on retryable failures"""
+    exc = retry_state.outcome.exception()
+    if exc is None:
+        return False
+    # The method may be passed positionally or by keyword
+    method = retry_state.kwargs.get('method') or retry_state.args[1]
+    return _is_retryable(method, exc)
+
+def _wait(retry_state: RetryCallState) -> float:
+    """Wait out a 429's Retry-After (capped), else back off exponentially"""
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429:
+        retry_after = exc.response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(int(retry_after), _MAX_RETRY_AFTER)
+    return _backoff(retry_state)
 
 class AffinityClient:
-    def __init__(self):
+    def __init__(self, http: Optional[httpx.AsyncClient] = None):
         self.api_key = os.getenv('AFFINITY_API_KEY')
         self.base_url = "https://api.affinity.co/api/v1"
         self.headers = {
@@ -18,130 +62,269 @@ class AffinityClient:
         # Initialize list IDs for different entity types
         self.incubators_list_id = os.getenv('AFFINITY_INCUBATORS_LIST_ID')
         self.portfolio_list_id = os.getenv('AFFINITY_PORTFOLIO_LIST_ID')
+        
+        # List name -> ID; lists are rarely renamed, so IDs stay valid for a while
+        self._list_id_cache = TTLCache(maxsize=256, ttl=600)
+        self._incubators_cache = TTLCache(maxsize=1, ttl=300)
+        self._company_cache = TTLCache(maxsize=256, ttl=300)
+        self._field_names_cache = TTLCache(maxsize=1, ttl=600)
+        
+        # One pooled async client keeps TLS connections to Affinity alive
+        # across calls without blocking the event loop
+        self.http = http or httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=30.0
+        )
 
-    def get_incubators_data(self) -> pd.DataFrame:
-        """Fetch incubators data from Affinity"""
+    async def aclose(self):
+        """Close the pooled HTTP client"""
+        await self.http.aclose()
+
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=_wait,
+        retry=_should_retry,
+        reraise=True
+    )
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request to Affinity, raising on error responses"""
+        response = await self.http.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    async def get_incubators_records(self) -> List[Dict]:
+        """Fetch incubators from Affinity as plain records"""
         try:
-            url = f"{self.base_url}/lists/{self.incubators_list_id}/list-entries"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            
-            # Extract relevant fields from response
-            incubators = []
-            for entry in response.json():
-                incubator = {
-                    'name': entry.get('name', ''),
-                    'portfolio_url': self._get_field_value(entry, 'portfolio_url'),
-                    'location': self._get_field_value(entry, 'location'),
-                    'focus_areas': self._get_field_value(entry, 'focus_areas'),
-                    'status': entry.get('status', '')
-                }
-                incubators.append(incubator)
-            
-            return pd.DataFrame(incubators)
+            url = f"/lists/{self.incubators_list_id}/list-entries"
+            
+            # Extract relevant fields page by page
+            return [self._incubator_record(entry) async for entry in self._paginate(url)]
             
         except Exception as e:
             raise Exception(f"Failed to fetch incubators data: {str(e)}")
 
-    def update_portfolio_data(self, incubator_name: str, portfolio_data: List[Dict]):
+    async def get_incubators_data(self) -> pd.DataFrame:
+        """Fetch incubators data from Affinity"""
+        return pd.DataFrame(await self.get_incubators_records())
+
+    async def get_incubator(self, incubator_name: str) -> Optional[Dict]:
+        """Look up a single incubator by name"""
+        incubators = self._incubators_cache.get('by_name')
+        if incubators is None:
+            records = await self.get_incubators_records()
+            incubators = {incubator['name']: incubator for incubator in records}
+            self._incubators_cache['by_name'] = incubators
+        return incubators.get(incubator_name)
+
+    def invalidate_incubators(self):
+        """Drop the cached incubator lookup"""
+        self._incubators_cache.clear()
+
+    async def update_portfolio_data(self, incubator_name: str, portfolio_data: List[Dict]):
         """Update portfolio company data in Affinity"""
         try:
             # Create a new list for the incubator's portfolio if it doesn't exist
             list_name = f"Portfolio_{incubator_name}"
-            portfolio_list_id = self._get_or_create_list(list_name)
+            portfolio_list_id = await self._get_or_create_list(list_name)
+            
+            # Upsert companies concurrently over the pooled connections,
+            # bounded so a large portfolio doesn't flood Affinity
+            semaphore = asyncio.Semaphore(10)
+            
+            async def upsert(company: Dict):
+                async with semaphore:
+                    await self._create_or_update_company(portfolio_list_id, company)
             
-            # Process each company
-            for company in portfolio_data:
-                self._create_or_update_company(portfolio_list_id, company)
+            results = await asyncio.gather(
+                *(upsert(company) for company in portfolio_data),
+                return_exceptions=True
+            )
+            
+            # One bad record shouldn't abort the rest of the batch
+            for company, result in zip(portfolio_data, results):
+                if isinstance(result, Exception):
+                    print(f"Error updating {company.get('name', '')}: {str(result)}")
+                self._company_cache.pop(company.get('name', '').lower(), None)
                 
         except Exception as e:
             raise Exception(f"Failed to update portfolio data: {str(e)}")
 
-    def get_portfolio_data(self, incubator_name: str) -> pd.DataFrame:
-        """Fetch portfolio data for a specific incubator"""
+    async def get_portfolio_records(self, incubator_name: str) -> List[Dict]:
+        """Fetch portfolio companies for a specific incubator as plain records"""
         try:
             # Get the list ID for this incubator's portfolio
             list_name = f"Portfolio_{incubator_name}"
-            list_id = self._get_list_id_by_name(list_name)
+            list_id = await self._get_list_id_by_name(list_name)
             
             if not list_id:
-                return pd.DataFrame()  # Return empty DataFrame if list doesn't exist
+                return []  # No records if the list doesn't exist
             
             # Fetch all companies in this list
-            url = f"{self.base_url}/lists/{list_id}/list-entries"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            
-            # Extract company data
-            companies = []
-            for entry in response.json():
-                company = {
-                    'name': entry.get('name', ''),
-                    'description': self._get_field_value(entry, 'description'),
-                    'founders': self._get_field_value(entry, 'founders'),
-                    'problem': self._get_field_value(entry, 'problem'),
-                    'solution': self._get_field_value(entry, 'solution'),
-                    'usp': self._get_field_value(entry, 'usp'),
-                    'sectors': self._get_field_value(entry, 'sectors'),
-                }
-                companies.append(company)
-            
-            return pd.DataFrame(companies)
+            url = f"/lists/{list_id}/list-entries"
+            
+            # Extract company data page by page
+            return [self._company_record(entry) async for entry in self._paginate(url)]
             
         except Exception as e:
             raise Exception(f"Failed to fetch portfolio data: {str(e)}")
 
-    def _get_or_create_list(self, list_name: str) -> str:
+    async def get_portfolio_data(self, incubator_name: str) -> pd.DataFrame:
+        """Fetch portfolio data for a specific incubator"""
+        return pd.DataFrame(await self.get_portfolio_records(incubator_name))
+
+    async def get_company_data(self, company_name: str) -> Optional[Dict]:
+        """Look up a company's organization in Affinity and read its field values"""
+        key = company_name.lower()
+        company = self._company_cache.get(key)
+        if company is not None:
+            return company
+        
+        try:
+            # Search is fuzzy, so only accept an exact (case-insensitive) name match
+            response = await self._request("GET", "/organizations", params={"term": company_name})
+            organization = next(
+                (org for org in response.json().get('organizations', [])
+                 if org.get('name', '').lower() == key),
+                None
+            )
+            if organization is None:
+                return None
+            
+            field_names = await self._get_field_names()
+            response = await self._request(
+                "GET", "/field-values", params={"organization_id": organization['id']}
+            )
+            
+            # Multi-valued fields (e.g. founders) come back as one value each
+            fields = {}
+            for field_value in response.json():
+                name = field_names.get(field_value['field_id'])
+                if name is None:
+                    continue
+                value = self._field_value_text(field_value['value'])
+                if name in fields:
+                    existing = fields[name]
+                    fields[name] = (existing if isinstance(existing, list) else [existing]) + [value]
+                else:
+                    fields[name] = value
+            
+            company = self._company_record({'name': organization['name'], 'fields': fields})
+            self._company_cache[key] = company
+            return company
+            
+        except Exception as e:
+            raise Exception(f"Failed to fetch company data: {str(e)}")
+
+    async def _get_field_names(self) -> Dict[int, str]:
+        """Get the field ID -> name mapping used to read field values"""
+        field_names = self._field_names_cache.get('by_id')
+        if field_names is None:
+            response = await self._request("GET", "/fields")
+            field_names = {field['id']: field['name'] for field in response.json()}
+            self._field_names_cache['by_id'] = field_names
+        return field_names
+
+    def _field_value_text(self, value) -> str:
+        """Render an Affinity field value as text; dropdown values are objects"""
+        if isinstance(value, dict):
+            return value.get('text', '')
+        return '' if value is None else str(value)
+
+    async def _paginate(self, url: str, page_size: int = 500) -> AsyncIterator[Dict]:
+        """Yield list entries across all pages of an Affinity list-entries endpoint"""
+        params = {"page_size": page_size}
+        while True:
+            response = await self._request("GET", url, params=params)
+            page = response.json()
+            
+            for entry in page.get('list_entries', []):
+                yield entry
+            
+            next_page_token = page.get('next_page_token')
+            if not next_page_token:
+                return
+            params["page_token"] = next_page_token
+
+    def _incubator_record(self, entry: Dict) -> Dict:
+        """Extract incubator fields from an Affinity list entry"""
+        return {
+            'name': entry.get('name', ''),
+            'portfolio_url': self._get_field_value(entry, 'portfolio_url'),
+            'location': self._get_field_value(entry, 'location'),
+            'focus_areas': self._get_field_value(entry, 'focus_areas'),
+            'status': entry.get('status', '')
+        }
+
+    def _company_record(self, entry: Dict) -> Dict:
+        """Extract portfolio company fields from an Affinity list entry"""
+        return {
+            'name': entry.get('name', ''),
+            'description': self._get_field_value(entry, 'description'),
+            'founders': self._get_field_value(entry, 'founders'),
+            'problem': self._get_field_value(entry, 'problem'),
+            'solution': self._get_field_value(entry, 'solution'),
+            'usp': self._get_field_value(entry, 'usp'),
+            'sectors': self._get_field_value(entry, 'sectors'),
+        }
+
+    async def _get_or_create_list(self, list_name: str) -> str:
         """Get or create a list in Affinity"""
-        list_id = self._get_list_id_by_name(list_name)
+        list_id = await self._get_list_id_by_name(list_name)
         if list_id:
             return list_id
             
         # Create new list
-        url = f"{self.base_url}/lists"
-        response = requests.post(
+        url = "/lists"
+        response = await self._request(
+            "POST",
             url,
-            headers=self.headers,
             json={"name": list_name}
         )
-        response.raise_for_status()
-        return response.json()['id']
+        list_id = response.json()['id']
+        self._list_id_cache[list_name] = list_id
+        return list_id
 
-    def _get_list_id_by_name(self, list_name: str) -> str:
+    async def _get_list_id_by_name(self, list_name: str) -> str:
         """Get list ID by name"""
-        url = f"{self.base_url}/lists"
-        response = requests.get(url, headers=self.headers)
-        response.raise_for_status()
+        list_id = self._list_id_cache.get(list_name)
+        if list_id is not None:
+            return list_id
+        
+        url = "/lists"
+        response = await self._request("GET", url)
         
+        # Remember every list from this response, not just the one asked for
         for list_info in response.json():
+            self._list_id_cache[list_info['name']] = list_info['id']
             if list_info['name'] == list_name:
-                return list_info['id']
-        return None
+                list_id = list_info['id']
+        return list_id
 
-    def _create_or_update_company(self, list_id: str, company_data: Dict):
+    async def _create_or_update_company(self, list_id: str, company_data: Dict):
         """Create or update a company entry in Affinity"""
         # Check if company exists
-        url = f"{self.base_url}/lists/{list_id}/list-entries"
+        url = f"/lists/{list_id}/list-entries"
         params = {"term": company_data['name']}
-        response = requests.get(url, headers=self.headers, params=params)
-        response.raise_for_status()
+        response = await self._request("GET", url, params=params)
         
         existing_entries = response.json()
         
         if existing_entries:
             # Update existing company
             entry_id = existing_entries[0]['id']
-            url = f"{self.base_url}/lists/{list_id}/list-entries/{entry_id}"
-            requests.put(
+            url = f"/lists/{list_id}/list-entries/{entry_id}"
+            await self._request(
+                "PUT",
                 url,
-                headers=self.headers,
                 json=self._prepare_company_data(company_data)
             )
         else:
             # Create new company
-            requests.post(
+            await self._request(
+                "POST",
                 url,
-                headers=self.headers,
                 json=self._prepare_company_data(company_data)
             )
 
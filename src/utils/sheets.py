@@ -1,11 +1,12 @@
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 import pandas as pd
-from typing import List, Dict
+from cachetools import TTLCache
+from typing import List, Dict, Optional
 import os
-from dotenv import load_dotenv
+from config.config import load_env
 
-load_dotenv()
+load_env()
 
 class GoogleSheetsClient:
     def __init__(self):
@@ -16,6 +17,7 @@ class GoogleSheetsClient:
         self.creds_path = os.getenv('GOOGLE_SHEETS_CREDENTIALS')
         self.spreadsheet_id = os.getenv('SPREADSHEET_ID')
         self.client = self._authenticate()
+        self._incubators_cache = TTLCache(maxsize=1, ttl=300)
 
     def _authenticate(self) -> gspread.Client:
         """Authenticate with Google Sheets API"""
@@ -26,15 +28,40 @@ class GoogleSheetsClient:
         except Exception as e:
             raise Exception(f"Authentication failed: {str(e)}")
 
-    def get_incubators_data(self) -> pd.DataFrame:
-        """Fetch incubators data from the Google Sheet"""
+    def _to_records(self, worksheet: gspread.Worksheet) -> List[Dict]:
+        """Build plain row dicts from a worksheet's header and rows"""
+        # get_all_values returns one 2D list in a single API call
+        values = worksheet.get_all_values()
+        if len(values) < 2:
+            return []
+        header, rows = values[0], values[1:]
+        return [dict(zip(header, row)) for row in rows]
+
+    def get_incubators_records(self) -> List[Dict]:
+        """Fetch incubators from the Google Sheet as plain records"""
         try:
             sheet = self.client.open_by_key(self.spreadsheet_id).sheet1
-            data = sheet.get_all_records()
-            return pd.DataFrame(data)
+            return self._to_records(sheet)
         except Exception as e:
             raise Exception(f"Failed to fetch incubators data: {str(e)}")
 
+    def get_incubators_data(self) -> pd.DataFrame:
+        """Fetch incubators data from the Google Sheet"""
+        return pd.DataFrame(self.get_incubators_records())
+
+    def get_incubator(self, incubator_name: str) -> Optional[Dict]:
+        """Look up a single incubator by name"""
+        incubators = self._incubators_cache.get('by_name')
+        if incubators is None:
+            records = self.get_incubators_records()
+            incubators = {incubator['name']: incubator for incubator in records}
+            self._incubators_cache['by_name'] = incubators
+        return incubators.get(incubator_name)
+
+    def invalidate_incubators(self):
+        """Drop the cached incubator lookup"""
+        self._incubators_cache.clear()
+
     def update_portfolio_data(self, incubator_name: str, portfolio_data: List[Dict]):
         """Update portfolio data for a specific incubator"""
         try:
@@ -52,17 +79,29 @@ class GoogleSheetsClient:
             # Convert portfolio data to DataFrame and update sheet
             df = pd.DataFrame(portfolio_data)
             worksheet.clear()
-            worksheet.update([df.columns.values.tolist()] + df.values.tolist())
+            if df.empty:
+                return
+            
+            # Write everything in one call; RAW skips server-side parsing of each cell
+            values = [df.columns.tolist()] + df.fillna('').astype(str).values.tolist()
+            end_cell = gspread.utils.rowcol_to_a1(len(values), len(df.columns))
+            worksheet.batch_update(
+                [{"range": f"A1:{end_cell}", "values": values}],
+                value_input_option="RAW"
+            )
             
         except Exception as e:
             raise Exception(f"Failed to update portfolio data: {str(e)}")
 
-    def get_portfolio_data(self, incubator_name: str) -> pd.DataFrame:
-        """Fetch portfolio data for a specific incubator"""
+    def get_portfolio_records(self, incubator_name: str) -> List[Dict]:
+        """Fetch portfolio companies for a specific incubator as plain records"""
         try:
             worksheet = self.client.open_by_key(self.spreadsheet_id).worksheet(
                 f"Portfolio_{incubator_name}")
-            data = worksheet.get_all_records()
-            return pd.DataFrame(data)
+            return self._to_records(worksheet)
         except Exception as e:
-            raise Exception(f"Failed to fetch portfolio data: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Failed to fetch portfolio data: {str(e)}")
+
+    def get_portfolio_data(self, incubator_name: str) -> pd.DataFrame:
+        """Fetch portfolio data for a specific incubator"""
+        return pd.DataFrame(self.get_portfolio_records(incubator_name)) 
\ No newline at end of file
@@ -0,0 +1,186 @@
+import asyncio
+
+import httpx
+
+from src.utils import affinity_client
+from src.utils.affinity_client import AffinityClient
+
+
+def make_client(handler):
+    """Build an AffinityClient whose HTTP calls are answered by handler"""
+    http = httpx.AsyncClient(base_url="https://affinity.test", transport=httpx.MockTransport(handler))
+    return AffinityClient(http=http)
+
+
+def test_get_company_data_reads_organization_field_values():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path == "/organizations":
+            return httpx.Response(200, json={"organizations": [
+                {"id": 1, "name": "Acme Robotics Labs"},
+                {"id": 2, "name": "Acme Robotics"},
+            ]})
+        if request.url.path == "/fields":
+            return httpx.Response(200, json=[
+                {"id": 10, "name": "description"},
+                {"id": 11, "name": "founders"},
+                {"id": 12, "name": "sectors"},
+            ])
+        if request.url.path == "/field-values":
+            assert request.url.params["organization_id"] == "2"
+            return httpx.Response(200, json=[
+                {"field_id": 10, "value": "Warehouse robots"},
+                {"field_id": 11, "value": "Jane Doe"},
+                {"field_id": 11, "value": "John Roe"},
+                {"field_id": 12, "value": {"id": 5, "text": "ai"}},
+                {"field_id": 99, "value": "not a known field"},
+            ])
+        return httpx.Response(404)
+
+    client = make_client(handler)
+    company = asyncio.run(client.get_company_data("acme robotics"))
+
+    assert company == {
+        'name': "Acme Robotics",
+        'description': "Warehouse robots",
+        'founders': ["Jane Doe", "John Roe"],
+        'problem': '',
+        'solution': '',
+        'usp': '',
+        'sectors': "ai",
+    }
+
+    # Served from the cache the second time
+    calls.clear()
+    assert asyncio.run(client.get_company_data("Acme Robotics")) == company
+    assert calls == []
+
+
+def test_get_company_data_returns_none_without_exact_match():
+    def handler(request):
+        return httpx.Response(200, json={"organizations": [{"id": 1, "name": "Acme Robotics Labs"}]})
+
+    client = make_client(handler)
+    assert asyncio.run(client.get_company_data("Acme Robotics")) is None
+
+
+class RetryRecorder:
+    """Counts requests per method and records tenacity's waits instead of sleeping"""
+
+    def __init__(self, monkeypatch):
+        self.sent = []
+        self.waits = []
+        monkeypatch.setattr(affinity_client, "_backoff", lambda retry_state: 0)
+
+        async def sleep(seconds):
+            self.waits.append(seconds)
+
+        monkeypatch.setattr(AffinityClient._request.retry, "sleep", sleep)
+
+
+def run_request(client, *args, **kwargs):
+    """Run _request, returning the raised exception instead of propagating it"""
+    try:
+        return asyncio.run(client._request(*args, **kwargs))
+    except Exception as e:
+        return e
+
+
+def test_post_is_not_retried_after_server_error(monkeypatch):
+    recorder = RetryRecorder(monkeypatch)
+
+    def handler(request):
+        recorder.sent.append(request.method)
+        return httpx.Response(503)
+
+    client = make_client(handler)
+    result = run_request(client, "POST", "/lists", json={"name": "Portfolio_Acme"})
+
+    assert isinstance(result, httpx.HTTPStatusError)
+    assert recorder.sent == ["POST"]
+
+
+def test_post_passed_by_keyword_is_not_retried(monkeypatch):
+    recorder = RetryRecorder(monkeypatch)
+
+    def handler(request):
+        recorder.sent.append(request.method)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    client = make_client(handler)
+    result = run_request(client, method="POST", url="/lists")
+
+    assert isinstance(result, httpx.ReadTimeout)
+    assert recorder.sent == ["POST"]
+
+
+def test_get_is_retried_on_server_error(monkeypatch):
+    recorder = RetryRecorder(monkeypatch)
+
+    def handler(request):
+        recorder.sent.append(request.method)
+        return httpx.Response(500)
+
+    client = make_client(handler)
+    result = run_request(client, "GET", "/lists")
+
+    assert isinstance(result, httpx.HTTPStatusError)
+    assert recorder.sent == ["GET"] * 5
+
+
+def test_post_is_retried_when_the_connection_failed(monkeypatch):
+    recorder = RetryRecorder(monkeypatch)
+
+    def handler(request):
+        recorder.sent.append(request.method)
+        if len(recorder.sent) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={"id": 7})
+
+    client = make_client(handler)
+    response = run_request(client, "POST", "/lists")
+
+    assert response.json() == {"id": 7}
+    assert recorder.sent == ["POST", "POST"]
+
+
+def test_rate_limit_waits_for_capped_retry_after(monkeypatch):
+    recorder = RetryRecorder(monkeypatch)
+    retry_afters = ["3", "3600"]
+
+    def handler(request):
+        recorder.sent.append(request.method)
+        if retry_afters:
+            return httpx.Response(429, headers={"Retry-After": retry_afters.pop(0)})
+        return httpx.Response(200, json=[])
+
+    client = make_client(handler)
+    response = run_request(client, "POST", "/lists")
+
+    assert response.status_code == 200
+    assert recorder.sent == ["POST"] * 3
+    assert recorder.waits == [3, 10]
+
+
+def test_paginate_follows_next_page_token():
+    pages = {
+        None: {"list_entries": [{"name": "A"}, {"name": "B"}], "next_page_token": "t1"},
+        "t1": {"list_entries": [{"name": "C"}], "next_page_token": "t2"},
+        "t2": {"list_entries": [], "next_page_token": None},
+    }
+    tokens = []
+
+    def handler(request):
+        token = request.url.params.get("page_token")
+        tokens.append(token)
+        assert request.url.params["page_size"] == "500"
+        return httpx.Response(200, json=pages[token])
+
+    async def collect(client):
+        return [entry["name"] async for entry in client._paginate("/lists/1/list-entries")]
+
+    client = make_client(handler)
+    assert asyncio.run(collect(client)) == ["A", "B", "C"]
+    assert tokens == [None, "t1", "t2"]
@@ -0,0 +1,43 @@
+from src.data_processing.email_processor import EmailProcessor
+
+
+class FakeMail:
+    """Answers header FETCHes the way imaplib does: tuples interleaved with b')'"""
+
+    def __init__(self, subjects):
+        self.subjects = subjects
+        self.commands = []
+
+    def fetch(self, message_set, message_parts):
+        self.commands.append((message_set, message_parts))
+        data = []
+        for msg_id in message_set.split(b','):
+            header = f"Subject: {self.subjects[msg_id]}\r\n\r\n".encode()
+            envelope = msg_id + b' (BODY[HEADER.FIELDS (SUBJECT)] {%d}' % len(header)
+            data.extend([(envelope, header), b')'])
+        return 'OK', data
+
+
+def test_prefilter_keeps_deal_intro_and_forward_subjects():
+    mail = FakeMail({
+        b'1': "Seed round for our startup",
+        b'2': "Intro: Jane <> John",
+        b'3': "Fwd: worth a look",
+        b'4': "Introducing Acme",
+        b'5': "Acme is raising",
+        b'6': "Your weekly newsletter",
+        b'7': "Lunch on Friday?",
+        b'8': "Thought you might be interested in this",
+    })
+
+    candidates = EmailProcessor()._prefilter_by_subject(mail, [b'1', b'2', b'3', b'4', b'5', b'6', b'7', b'8'])
+
+    assert candidates == [b'1', b'2', b'3', b'4', b'5', b'8']
+    # Headers only, without marking anything as read
+    assert mail.commands == [(b'1,2,3,4,5,6,7,8', '(BODY.PEEK[HEADER.FIELDS (SUBJECT)])')]
+
+
+def test_prefilter_skips_fetch_without_messages():
+    mail = FakeMail({})
+    assert EmailProcessor()._prefilter_by_subject(mail, []) == []
+    assert mail.commands == []
@@ -0,0 +1,36 @@
+import pytest
+
+from src.crawlers.portfolio_crawler import PortfolioCrawler
+
+
+@pytest.fixture
+def crawler():
+    crawler = PortfolioCrawler()
+    yield crawler
+    crawler.close()
+
+
+def substring_scores(crawler, text):
+    """Reference scoring: share of each sector's keywords found in the text"""
+    text = text.lower()
+    return {
+        sector: sum(1 for keyword in keywords if keyword in text) / len(keywords)
+        for sector, keywords in crawler.sector_keywords.items()
+    }
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "Clean Energy storage for the CLIMATE; carbon capture",
+    "Healthcare platform: biotech and pharma in the cloud, sold by subscription",
+    "Deep learning and machine learning on a neural network, machine learning again",
+    "Unhealthy carbonated drinks",
+])
+def test_identify_sectors_matches_substring_scoring(crawler, text):
+    assert crawler._identify_sectors(text) == pytest.approx(substring_scores(crawler, text))
+
+
+def test_identify_sectors_counts_repeated_keywords_once(crawler):
+    scores = crawler._identify_sectors("cloud cloud cloud")
+
+    assert scores == {'climate_tech': 0.0, 'health_tech': 0.0, 'ai': 0.0, 'saas': 0.25}
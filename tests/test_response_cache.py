@@ -0,0 +1,79 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from src.main import _invalidate_cache, app, get_affinity_client
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.matches = []
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    async def scan_iter(self, match):
+        self.matches.append(match)
+        for key in list(self.store):
+            yield key
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+class FakeAffinityClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_incubators_records(self):
+        self.calls += 1
+        return [{"name": "Example Incubator"}]
+
+
+def test_cache_hit_keeps_cors_headers():
+    affinity_client = FakeAffinityClient()
+    app.state.redis = FakeRedis()
+    app.dependency_overrides[get_affinity_client] = lambda: affinity_client
+    try:
+        # Not used as a context manager, so startup doesn't build real clients
+        client = TestClient(app)
+        headers = {"Origin": "http://example.com"}
+
+        miss = client.get("/incubators", headers=headers)
+        hit = client.get("/incubators", headers=headers)
+
+        assert miss.headers["x-cache"] == "MISS"
+        assert hit.headers["x-cache"] == "HIT"
+        assert hit.json() == miss.json()
+        assert affinity_client.calls == 1
+        for response in (miss, hit):
+            assert response.headers["access-control-allow-origin"] == "*"
+    finally:
+        app.dependency_overrides.clear()
+        app.state.redis = None
+
+
+def test_requests_work_before_startup_sets_redis():
+    if hasattr(app.state, "redis"):
+        del app.state.redis
+
+    response = TestClient(app).get("/health")
+
+    assert response.status_code == 200
+    assert "x-cache" not in response.headers
+
+
+def test_invalidate_cache_escapes_glob_metacharacters():
+    redis = FakeRedis()
+    app.state.redis = redis
+    try:
+        asyncio.run(_invalidate_cache("/portfolio/A*B?[C]\\"))
+    finally:
+        app.state.redis = None
+
+    assert redis.matches == ["mcp:/portfolio/A\\*B\\?\\[C\\]\\\\*"]
@@ -0,0 +1,57 @@
+import pytest
+
+from src.models.scoring import CompanyScorer
+
+# Scores produced by the original per-indicator substring scan, which the
+# single-pass automaton must reproduce
+BASELINE_SCORES = [
+    (
+        {
+            'founders': 'PhD from Stanford, ex-Google engineer with 10 years experience in AI and Machine Learning',
+            'description': 'An innovative B2B SaaS platform with recurring revenue and a growing market; '
+                           'a breakthrough in sustainable supply chains',
+            'problem': 'Carbon emissions in logistics hurt communities and the environment',
+            'solution': 'Patented machine learning system with proprietary data, a working prototype '
+                        'and pilot customers; scalable',
+            'usp': 'Unique network effects and a first-mover advantage; disruptive',
+        },
+        0.16499999999999998,
+        {'team': 0.09523809523809523, 'business': 0.25555555555555554,
+         'technology': 0.20000000000000004, 'impact': 0.1},
+    ),
+    (
+        # Phrases shared by several indicator categories
+        {'founders': '', 'description': 'A breakthrough and unique approach', 'problem': '',
+         'solution': '', 'usp': 'innovative'},
+        0.05999999999999999,
+        {'team': 0.0, 'business': 0.19999999999999998, 'technology': 0.0, 'impact': 0.0},
+    ),
+    (
+        # Mixed case and indicators embedded in longer words
+        {'founders': 'MBA, Harvard alumni', 'description': 'MARKETPLACE for Social Impact investors; ESG reporting',
+         'problem': 'inequality', 'solution': 'Blockchain-based API', 'usp': 'Exclusive PARTNERSHIPS'},
+        0.04666666666666666,
+        {'team': 0.047619047619047616, 'business': 0.0, 'technology': 0.0, 'impact': 0.2},
+    ),
+    (
+        {},
+        0.0,
+        {'team': 0.0, 'business': 0.0, 'technology': 0.0, 'impact': 0.0},
+    ),
+]
+
+
+@pytest.mark.parametrize("company_data, total_score, component_scores", BASELINE_SCORES)
+def test_score_company_matches_baseline(company_data, total_score, component_scores):
+    scores = CompanyScorer().score_company(company_data)
+
+    assert scores['total_score'] == pytest.approx(total_score)
+    assert scores['component_scores'] == pytest.approx(component_scores)
+
+
+def test_list_fields_score_like_joined_text():
+    scorer = CompanyScorer()
+    as_list = scorer.score_company({'founders': ['PhD', 'ex-Google'], 'description': 'SaaS'})
+    as_text = scorer.score_company({'founders': 'PhD ex-Google', 'description': 'SaaS'})
+
+    assert as_list == as_text